@@ -1,16 +1,8 @@
-from .config_and_parser import (
-    LightningConfig,
-    cache_and_parse,
-    get_events,
-    bucket_dataframe_lightnings,
-    display_stats,
-    export_as_csv,
-    export_general_stats,
-    export_all_strikes,
-    export_strike_stitchings,
-)
+import importlib
 
-__all__ = [
+# Public names re-exported from config_and_parser. They are only imported on first access (PEP 562),
+# so importing the package stays cheap until something is actually used.
+_CONFIG_AND_PARSER_ATTRIBUTES = (
     "LightningConfig",
     "cache_and_parse",
     "get_events",
@@ -20,5 +12,27 @@ __all__ = [
     "export_general_stats",
     "export_all_strikes",
     "export_strike_stitchings",
-    "number_crunchers",
-]
\ No newline at end of file
+)
+
+__all__ = list(_CONFIG_AND_PARSER_ATTRIBUTES) + ["number_crunchers"]
+
+
+def __getattr__(name):
+    """
+    Import config_and_parser (or the number_crunchers subpackage) on first access, and cache the
+    attribute in this module so later lookups skip this function.
+    """
+    if name == "number_crunchers":
+        return importlib.import_module(".number_crunchers", __name__)
+    if name not in _CONFIG_AND_PARSER_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".config_and_parser", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    List the lazily loaded names along with the module's own attributes.
+    """
+    return sorted(set(globals()) | set(__all__))
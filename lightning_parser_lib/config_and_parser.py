@@ -12,7 +12,8 @@ import os
 import shutil
 import numpy as np
 import pandas as pd
-from .number_crunchers import database_parser, lightning_bucketer, lightning_plotters, toolbox
+# lightning_plotters pulls in plotly, imageio and PIL, so it is only imported by the functions that plot.
+from .number_crunchers import database_parser, lightning_bucketer, lightning_stitcher, toolbox
 from .number_crunchers.toolbox import tprint
 from typing import Tuple, List
 from remote_functions import RemoteFunctions
@@ -38,7 +39,7 @@ class LightningConfig:
 
         self.cache_dir = cache_dir
         self.db_path = os.path.join(cache_dir, "lylout_db.db")
-        self.cache_path = os.path.join(cache_dir, "os_cache.pkl")
+        self.cache_path = os.path.join(cache_dir, "os_cache.txt")
 
         self.csv_dir = csv_dir
         self.export_dir = export_dir
@@ -218,7 +219,7 @@ def get_events(filters, config: LightningConfig) -> pd.DataFrame:
     return events
 
 @rf.as_remote()
-def bucket_dataframe_lightnings(events: pd.DataFrame, config: LightningConfig, params) -> tuple[List[List[int]], List[Tuple[int, int]]]:
+def bucket_dataframe_lightnings(events: pd.DataFrame, config: LightningConfig, params) -> Tuple[List[List[int]], List[np.ndarray]]:
     """
     Buckets events into lightning strikes based on provided parameters, using caching and multiprocessing.
 
@@ -228,17 +229,19 @@ def bucket_dataframe_lightnings(events: pd.DataFrame, config: LightningConfig, p
         params: Parameters for bucketing lightning strikes.
 
     Returns:
-        tuple: (bucketed_strikes_indices, bucketed_lightning_correlations)
+        tuple: (bucketed_strikes_indices, bucketed_lightning_correlations), where the correlations
+        hold one (E, 2) int32 array of (parent, child) correlations per cluster.
     """
     if server_sided_config_override:
         config = server_sided_config_override
 
     # Enable caching for the bucketer.
-    lightning_bucketer.RESULT_CACHE_FILE = os.path.join(config.cache_dir, "result_cache.pkl")
+    lightning_bucketer.RESULT_CACHE_DIR = os.path.join(config.cache_dir, "result_cache")
 
     # Set processing parameters.
     lightning_bucketer.NUM_CORES = config.num_cores
     lightning_bucketer.MAX_CHUNK_SIZE = 50000
+    lightning_stitcher.STITCH_NUM_CORES = config.num_cores
 
     bucketed_strikes_indices, bucketed_lightning_correlations = lightning_bucketer.bucket_dataframe_lightnings(events, params)
     if not bucketed_strikes_indices:
@@ -287,12 +290,12 @@ def delete_sql_database(config: LightningConfig):
 @rf.as_remote()
 def delete_pkl_cache(config: LightningConfig):
     """
-    This function deletes the pickled cache
+    This function deletes the cached bucketing results
     """
     if server_sided_config_override:
         config = server_sided_config_override
 
-    lightning_bucketer.RESULT_CACHE_FILE = os.path.join(config.cache_dir, "result_cache.pkl")
+    lightning_bucketer.RESULT_CACHE_DIR = os.path.join(config.cache_dir, "result_cache")
     lightning_bucketer.delete_result_cache()
 
 def export_as_csv(bucketed_strikes_indices: list[list[int]], events: pd.DataFrame, config: LightningConfig):
@@ -330,6 +333,8 @@ def export_general_stats(bucketed_strikes_indices: list[list[int]],
     if server_sided_config_override:
         config = server_sided_config_override
 
+    from .number_crunchers import lightning_plotters
+
     os.makedirs(config.export_dir, exist_ok=True)
 
     tprint("Plotting strike points over time")
@@ -368,6 +373,8 @@ def export_all_strikes(bucketed_strikes_indices: list[list[int]], events: pd.Dat
     if server_sided_config_override:
         config = server_sided_config_override
 
+    from .number_crunchers import lightning_plotters
+
     if os.path.exists(config.strike_dir):
         shutil.rmtree(config.strike_dir)
     os.makedirs(config.strike_dir, exist_ok=True)
@@ -391,6 +398,8 @@ def export_strike_stitchings(bucketed_lightning_correlations: list[list[int, int
     if server_sided_config_override:
         config = server_sided_config_override
 
+    from .number_crunchers import lightning_plotters
+
     tprint("Plotting all strike stitchings")
     if os.path.exists(config.strike_stitchings_dir):
         shutil.rmtree(config.strike_stitchings_dir)
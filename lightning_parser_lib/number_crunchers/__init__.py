@@ -1,88 +1,85 @@
-from .database_parser import (
-    get_dat_files_paths,
-    DEFAULT_STATION_MASK_ORDER,
-    transformer,
-    parse_lylout,
-    cache_and_parse_database,
-    query_events,
-    query_events_as_dataframe,
-    get_headers,
-)
-from .lightning_bucketer import (
-    bucket_dataframe_lightnings,
-    export_as_csv,
-    NUM_CORES,
-    MAX_CHUNK_SIZE,
-    RESULT_CACHE_FILE,
-)
-from .lightning_plotters import (
-    plot_strikes_over_time,
-    plot_avg_power_map,
-    generate_strike_gif,
-    plot_all_strikes,
-    plot_lightning_stitch,
-    plot_lightning_stitch_gif,
-    plot_all_strike_stitchings,
-)
-from .lightning_stitcher import (
-    stitch_lightning_strikes,
-    stitch_lightning_strike,
-    filter_correlations_by_chain_size,
-)
-from .logger import is_logged, log_file, LOG_FILE
-from .toolbox import (
-    tprint,
-    zig_zag_range,
-    chunk_items,
-    hash_string_list,
-    compute_directory_hash,
-    save_cache_quick,
-    is_cached,
-    cpu_pct_to_cores,
-    is_mostly_text,
-)
+import importlib
 
-__all__ = [
-    # database_parser
-    "get_dat_files_paths",
-    "DEFAULT_STATION_MASK_ORDER",
-    "transformer",
-    "parse_lylout",
-    "cache_and_parse_database",
-    "query_events",
-    "query_events_as_dataframe",
-    "get_headers",
-    # lightning_bucketer
-    "bucket_dataframe_lightnings",
-    "export_as_csv",
-    "NUM_CORES",
-    "MAX_CHUNK_SIZE",
-    "USE_CACHE",
-    "RESULT_CACHE_FILE",
-    # lightning_plotters
-    "plot_strikes_over_time",
-    "plot_avg_power_map",
-    "generate_strike_gif",
-    "plot_all_strikes",
-    "plot_lightning_stitch",
-    "plot_lightning_stitch_gif",
-    "plot_all_strike_stitchings",
-    # lightning_stitcher
-    "stitch_lightning_strikes",
-    "stitch_lightning_strike",
-    "filter_correlations_by_chain_size",
-    # logger
-    "is_logged",
-    "log_file",
-    "LOG_FILE",
-    # toolbox
-    "tprint",
-    "zig_zag_range",
-    "chunk_items",
-    "hash_string_list",
-    "compute_directory_hash",
-    "save_cache_quick",
-    "is_cached",
-    "cpu_pct_to_cores",
-    "is_mostly_text",
-]
+# Each public name and the submodule it lives in. The submodules are only imported on first access
+# (PEP 562), so e.g. using the bucketer never imports the plotting libraries.
+_SUBMODULE_ATTRIBUTES = {
+    "database_parser": (
+        "get_dat_files_paths",
+        "DEFAULT_STATION_MASK_ORDER",
+        "transformer",
+        "parse_lylout",
+        "cache_and_parse_database",
+        "query_events",
+        "query_events_as_dataframe",
+        "get_headers",
+    ),
+    "lightning_bucketer": (
+        "bucket_dataframe_lightnings",
+        "export_as_csv",
+        "NUM_CORES",
+        "MAX_CHUNK_SIZE",
+        "RESULT_CACHE_DIR",
+    ),
+    "lightning_plotters": (
+        "plot_strikes_over_time",
+        "plot_avg_power_map",
+        "generate_strike_gif",
+        "plot_all_strikes",
+        "plot_lightning_stitch",
+        "plot_lightning_stitch_gif",
+        "plot_all_strike_stitchings",
+    ),
+    "lightning_stitcher": (
+        "stitch_lightning_strikes",
+        "stitch_lightning_strike",
+        "filter_correlations_by_chain_size",
+        "STITCH_NUM_CORES",
+    ),
+    "logger": (
+        "is_logged",
+        "log_file",
+        "LOG_FILE",
+        "SHA256_BACKEND",
+    ),
+    "toolbox": (
+        "tprint",
+        "zig_zag_range",
+        "chunk_items",
+        "hash_string_list",
+        "compute_directory_hash",
+        "save_cache_quick",
+        "is_cached",
+        "cpu_pct_to_cores",
+        "is_mostly_text",
+    ),
+    "accelerators": (
+        "create_shared_array",
+        "attach_shared_array",
+    ),
+}
+
+_LAZY_ATTRIBUTES = {name: module for module, names in _SUBMODULE_ATTRIBUTES.items() for name in names}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """
+    Import the submodule that defines name (or the submodule itself) on first access, and cache
+    the attribute in this module so later lookups skip this function.
+    """
+    if name in _SUBMODULE_ATTRIBUTES:
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    List the lazily loaded names along with the module's own attributes.
+    """
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULE_ATTRIBUTES))
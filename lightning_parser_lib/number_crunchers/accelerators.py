@@ -0,0 +1,142 @@
+"""
+Helpers for the numeric kernels of the number crunchers: the optional Numba JIT and shared memory
+arrays for worker processes.
+
+They live apart from toolbox so that importing toolbox (e.g. just for tprint) does not load numba,
+numpy or multiprocessing.
+"""
+from typing import Any, Tuple
+from multiprocessing import shared_memory
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional. Without it, callers fall back to their pure Python/NumPy paths,
+    # and any @njit decorated kernel is left as a regular Python function.
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for numba.njit when numba is not installed.
+
+        Supports both the bare `@njit` and the parameterized `@njit(cache=True)` forms and
+        returns the decorated function unchanged.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def zig_zag_indices(max_value, start):
+    """
+    Numba kernel behind toolbox.zig_zag_range that fills an array with the zig-zag order in a single loop.
+
+    Parameters:
+      max_value (int): The exclusive upper bound for indices.
+      start (int): The starting index, which must be within [0, max_value).
+
+    Returns:
+      np.ndarray: An int64 array of length max_value holding the indices in zig-zag order.
+    """
+    out = np.empty(max_value, dtype=np.int64)
+    out[0] = start
+    k = 1
+    up_max = max_value - start - 1  # maximum upward steps possible
+    down_max = start              # maximum downward steps possible
+    max_d = max(up_max, down_max)
+
+    # Determine the first direction: if the space upward is smaller, go up first; otherwise, go down.
+    up_first = up_max < down_max
+
+    for d in range(1, max_d + 1):
+        if up_first:
+            if start + d < max_value:
+                out[k] = start + d
+                k += 1
+            if start - d >= 0:
+                out[k] = start - d
+                k += 1
+        else:
+            if start - d >= 0:
+                out[k] = start - d
+                k += 1
+            if start + d < max_value:
+                out[k] = start + d
+                k += 1
+    return out
+
+
+def zig_zag_indices_numpy(max_value: int, start: int) -> np.ndarray:
+    """
+    Vectorized NumPy equivalent of zig_zag_indices, used when numba is not available.
+
+    The zig-zag order is the start index followed by the upward arm (start + 1, start + 2, ...) and the
+    downward arm (start - 1, start - 2, ...) interleaved, with the rest of the longer arm at the end.
+
+    Parameters:
+      max_value (int): The exclusive upper bound for indices.
+      start (int): The starting index, which must be within [0, max_value).
+
+    Returns:
+      np.ndarray: An int64 array of length max_value holding the indices in zig-zag order.
+    """
+    ups = np.arange(start + 1, max_value, dtype=np.int64)
+    downs = np.arange(start - 1, -1, -1, dtype=np.int64)
+
+    # If the space upward is smaller, go up first; otherwise, go down.
+    first, second = (ups, downs) if len(ups) < len(downs) else (downs, ups)
+    num_pairs = len(first)
+
+    out = np.empty(max_value, dtype=np.int64)
+    out[0] = start
+    out[1:2 * num_pairs + 1:2] = first
+    out[2:2 * num_pairs + 2:2] = second[:num_pairs]
+    out[2 * num_pairs + 1:] = second[num_pairs:]
+    return out
+
+
+def create_shared_array(array: np.ndarray) -> shared_memory.SharedMemory:
+    """
+    Copies an array into a new shared memory block so that worker processes can read it without pickling.
+
+    Workers attach to the block with attach_shared_array using the block's name along with the shape and
+    dtype of the array. The creator is responsible for calling close() and unlink() on the returned block
+    once every worker is done with it.
+
+    Parameters:
+      array (np.ndarray): The array to copy into shared memory.
+
+    Returns:
+      shared_memory.SharedMemory: The shared memory block holding a copy of the array.
+
+    Example:
+      >>> shm = create_shared_array(np.arange(4.0))
+      >>> _, view = attach_shared_array(shm.name, (4,), np.float64)
+      >>> view
+      array([0., 1., 2., 3.])
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+
+def attach_shared_array(name: str, shape: Tuple[int, ...], dtype: Any) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attaches to a shared memory block created by create_shared_array and views it as an array.
+
+    The returned block must be kept alive for as long as the array view is used. Attaching does not take
+    ownership of the block, so only its creator unlinks it.
+
+    Parameters:
+      name (str): The name of the shared memory block.
+      shape (Tuple[int, ...]): The shape of the shared array.
+      dtype (Any): The dtype of the shared array.
+
+    Returns:
+      Tuple[shared_memory.SharedMemory, np.ndarray]: The attached block and an array view over its buffer.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
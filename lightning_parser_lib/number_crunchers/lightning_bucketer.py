@@ -1,28 +1,151 @@
 import numpy as np
 import pandas as pd
-import pickle as pkl
 import os
+import shutil
 import hashlib
+import json
+import struct
 import re
 import datetime
 from tqdm import tqdm
 from typing import List, Tuple, Optional
 import multiprocessing
-from collections import Counter
-from . import toolbox
+from . import accelerators
 from .toolbox import tprint
+from .accelerators import njit
 from . import lightning_stitcher
 
 
 
-# Global constants for cache handling.
-RESULT_CACHE_FILE: str = "result_cache.pkl"
+# Global constants for cache handling. Each cached result is stored as its own file in this directory.
+RESULT_CACHE_DIR: str = "result_cache"
 
 global_shutdown_event = None
+worker_columns = None
+worker_columns_shm = None
 
-def init_worker(shutdown_ev):
-    global global_shutdown_event
+def init_worker(shutdown_ev, shm_name=None, shape=None):
+    """
+    Set up a bucketing worker, attaching it to the shared (x, y, z, time_unix) event columns if given.
+    """
+    global global_shutdown_event, worker_columns, worker_columns_shm
     global_shutdown_event = shutdown_ev
+    if shm_name is not None:
+        worker_columns_shm, worker_columns = accelerators.attach_shared_array(shm_name, shape, np.float64)
+
+@njit(cache=True)
+def _cluster_group(x, y, z, t, min_pts, max_dur, max_dist_sq, max_dt, min_sp_sq, max_sp_sq):
+    """
+    Numba kernel that clusters the events of a single time group into lightning strikes.
+
+    This mirrors the Python clustering loop in _group_process, but stores the sub groups as
+    preallocated arrays instead of a list of dicts. Each sub group is a linked list of member
+    indices (sg_head/sg_tail into next_idx), and since the events are sorted by time, the
+    sub groups that exceeded max_dur always form a prefix that is skipped with a single pointer.
+
+    Parameters:
+      x, y, z (np.ndarray): float64 coordinates of the events in the group.
+      t (np.ndarray): float64 Unix timestamps of the events in the group, sorted ascending.
+      min_pts (int): Minimum number of events required to form a valid strike.
+      max_dur (float): Maximum allowed duration (in seconds) for a lightning strike.
+      max_dist_sq (float): Squared maximum allowed distance (in meters) between events.
+      max_dt (float): Maximum allowed time difference between events (seconds).
+      min_sp_sq (float): Squared minimum allowed speed (in m/s) between events.
+      max_sp_sq (float): Squared maximum allowed speed (in m/s) between events.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: A CSR style pair (members, offsets) where the local event
+      indices of strike s are members[offsets[s]:offsets[s + 1]].
+    """
+    n = t.shape[0]
+    sg_start_t = np.empty(n, dtype=np.float64)
+    sg_head = np.empty(n, dtype=np.int32)
+    sg_tail = np.empty(n, dtype=np.int32)
+    sg_len = np.zeros(n, dtype=np.int32)
+    next_idx = np.full(n, -1, dtype=np.int32)
+    n_sg = 0
+    lo = 0  # First sub group that has not exceeded max_dur yet.
+
+    for j in range(n):
+        event_t = t[j]
+
+        # Finalize subgroups that have exceeded max_lightning_duration.
+        while lo < n_sg and event_t - sg_start_t[lo] > max_dur:
+            lo += 1
+
+        found = -1
+        for s in range(lo, n_sg):
+            dist_ok = False
+            speed_ok = False
+            k = sg_head[s]
+            while k != -1:
+                dt = abs(event_t - t[k])
+                if dt <= max_dt:
+                    dx = x[k] - x[j]
+                    dy = y[k] - y[j]
+                    dz = z[k] - z[j]
+                    dist_sq = dx * dx + dy * dy + dz * dz
+                    if dist_sq <= max_dist_sq:
+                        dist_ok = True
+                    dt_sq = dt * dt
+                    if dt_sq < 1e-5:
+                        dt_sq = 1e-5
+                    speed_sq = dist_sq / dt_sq
+                    if speed_sq >= min_sp_sq and speed_sq <= max_sp_sq:
+                        speed_ok = True
+                    if dist_ok and speed_ok:
+                        break
+                k = next_idx[k]
+            if dist_ok and speed_ok:
+                found = s
+                break
+
+        if found == -1:
+            # Start a new subgroup.
+            sg_start_t[n_sg] = event_t
+            sg_head[n_sg] = j
+            sg_tail[n_sg] = j
+            sg_len[n_sg] = 1
+            n_sg += 1
+        else:
+            next_idx[sg_tail[found]] = j
+            sg_tail[found] = j
+            sg_len[found] += 1
+
+    # Subgroups are finalized in creation order, so emitting them by id preserves the output order.
+    n_strikes = 0
+    n_members = 0
+    for s in range(n_sg):
+        if sg_len[s] >= min_pts:
+            n_strikes += 1
+            n_members += sg_len[s]
+
+    members = np.empty(n_members, dtype=np.int32)
+    offsets = np.empty(n_strikes + 1, dtype=np.int32)
+    offsets[0] = 0
+    pos = 0
+    strike = 0
+    for s in range(n_sg):
+        if sg_len[s] >= min_pts:
+            k = sg_head[s]
+            while k != -1:
+                members[pos] = k
+                pos += 1
+                k = next_idx[k]
+            strike += 1
+            offsets[strike] = pos
+
+    return members, offsets
+
+
+def _grow(arr: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Return a copy of arr with room for capacity elements (contents past len(arr) are uninitialized).
+    """
+    grown = np.empty(capacity, dtype=arr.dtype)
+    grown[:len(arr)] = arr
+    return grown
+
 
 def _group_process(args_list):
     """
@@ -30,13 +153,11 @@ def _group_process(args_list):
     
     Parameters:
       args_list: Tuple containing:
-        - all_x_values: NumPy array of x coordinates for all lightning events.
-        - all_y_values: NumPy array of y coordinates for all lightning events.
-        - all_z_values: NumPy array of z coordinates for all lightning events.
-        - all_unix_values: NumPy array of Unix timestamps for all lightning events.
-        - unique_groups: Array of unique group identifiers (time buckets) for the current chunk.
+        - columns: The x, y, z and Unix timestamp arrays of all lightning events, or None to use the
+          columns shared with the worker process by init_worker.
+        - group_starts: Array of the first event index of each time group in the current chunk.
+        - group_ends: Array of one past the last event index of each time group in the current chunk.
         - min_pts: Minimum number of events required to form a valid strike.
-        - group_ids: Array mapping each event to its time group.
         - max_lightning_duration: Maximum allowed duration (in seconds) for a lightning strike.
         - max_dist_between_pts: Maximum allowed spatial distance (in meters) between events.
         - max_time_threshold: Maximum allowed time difference between consecutive events (seconds).
@@ -47,16 +168,25 @@ def _group_process(args_list):
       List of lightning strike clusters, each represented as a list of event indices.
     """
     # Unpack input arguments.
-    all_x_values, all_y_values, all_z_values, all_unix_values, unique_groups, min_pts, group_ids, max_lightning_duration, max_dist_between_pts, max_time_threshold, min_speed, max_speed = args_list
+    columns, group_starts, group_ends, min_pts, max_lightning_duration, max_dist_between_pts, max_time_threshold, min_speed, max_speed = args_list
+    if columns is None:
+        columns = worker_columns
+    all_x_values, all_y_values, all_z_values, all_unix_values = columns
 
     lightning_strikes = []
 
-    for group in unique_groups:
+    # Precompute squared thresholds.
+    max_dist_squared = float(max_dist_between_pts) ** 2
+    min_speed_squared = float(min_speed) ** 2
+    max_speed_squared = float(max_speed) ** 2
+
+    for group_start, group_end in zip(group_starts, group_ends):
 
         if global_shutdown_event and global_shutdown_event.is_set():
             break
 
-        group_indices = np.where(group_ids == group)[0]
+        # Time groups are contiguous ranges of the sorted events.
+        group_indices = np.arange(group_start, group_end, dtype=np.int32)
 
         # Skip groups with fewer points than required.
         if len(group_indices) < min_pts:
@@ -67,7 +197,41 @@ def _group_process(args_list):
         z_vals = all_z_values[group_indices]
         unix_vals = all_unix_values[group_indices]
 
-        sub_groups = []  # Will hold potential lightning strikes for this group
+        if accelerators.NUMBA_AVAILABLE:
+            members, offsets = _cluster_group(
+                np.ascontiguousarray(x_vals, dtype=np.float64),
+                np.ascontiguousarray(y_vals, dtype=np.float64),
+                np.ascontiguousarray(z_vals, dtype=np.float64),
+                np.ascontiguousarray(unix_vals, dtype=np.float64),
+                min_pts,
+                float(max_lightning_duration),
+                max_dist_squared,
+                float(max_time_threshold),
+                min_speed_squared,
+                max_speed_squared,
+            )
+            for s in range(len(offsets) - 1):
+                lightning_strikes.append(group_indices[members[offsets[s]:offsets[s + 1]]])
+            continue
+
+        # Structure-of-arrays storage for the members of every active subgroup. The arrays
+        # grow by doubling, and sg_gid holds the id of the subgroup each member belongs to.
+        capacity = 64
+        sg_x = np.empty(capacity, dtype=np.float64)
+        sg_y = np.empty(capacity, dtype=np.float64)
+        sg_z = np.empty(capacity, dtype=np.float64)
+        sg_t = np.empty(capacity, dtype=np.float64)
+        sg_j = np.empty(capacity, dtype=np.int64)
+        sg_gid = np.empty(capacity, dtype=np.int64)
+        n_members = 0
+
+        # Start times and sizes indexed by subgroup id. Ids are handed out in creation order and
+        # there is at most one subgroup per event. Since events arrive in time order, the start
+        # times are monotonic and the active subgroups are always the ids [sg_head, next_id).
+        sg_start_t = np.empty(len(x_vals), dtype=np.float64)
+        sg_len = np.empty(len(x_vals), dtype=np.int64)
+        sg_head = 0
+        next_id = 0
 
         for j in range(len(x_vals)):
             if global_shutdown_event and global_shutdown_event.is_set():
@@ -77,74 +241,83 @@ def _group_process(args_list):
             event_z = z_vals[j]
             event_unix = unix_vals[j]
 
-            # Finalize subgroups that have exceeded max_lightning_duration.
-            lightning_strikes += [
-                [group_indices[idx] for idx in sg["indices"]]
-                for sg in sub_groups
-                if event_unix - np.array(sg["unix"])[0] > max_lightning_duration and len(sg["indices"]) >= min_pts
-            ]
-            sub_groups = [
-                sg for sg in sub_groups
-                if event_unix - np.array(sg["unix"])[0] <= max_lightning_duration
-            ]
-
-            max_dist_squared = max_dist_between_pts ** 2
-            min_speed_squared = min_speed ** 2
-            max_speed_squared = max_speed ** 2
+            # Finalize subgroups that have exceeded max_lightning_duration (always the oldest ones).
+            expired_head = sg_head
+            while sg_head < next_id and event_unix - sg_start_t[sg_head] > max_lightning_duration:
+                sg_head += 1
+            if sg_head > expired_head:
+                member_expired = sg_gid[:n_members] < sg_head
+                expired_gid = sg_gid[:n_members][member_expired]
+                expired_j = sg_j[:n_members][member_expired]
+                for sg_id in range(expired_head, sg_head):
+                    if sg_len[sg_id] >= min_pts:
+                        lightning_strikes.append(group_indices[expired_j[expired_gid == sg_id]])
+
+                keep = np.where(~member_expired)[0]
+                n_members = len(keep)
+                for arr in (sg_x, sg_y, sg_z, sg_t, sg_j, sg_gid):
+                    arr[:n_members] = arr[keep]
 
             found = False
-            for sg in sub_groups:
-                if global_shutdown_event and global_shutdown_event.is_set():
-                    break
-                # Convert list to array for vectorized operations.
-                sg_unix = np.array(sg["unix"])
-                dt_all = np.abs(event_unix - sg_unix)
+            if n_members > 0:
+                dt_all = np.abs(event_unix - sg_t[:n_members])
                 candidate_mask = dt_all <= max_time_threshold
-                if not np.any(candidate_mask):
-                    continue
+                if np.any(candidate_mask):
+                    # Position of each candidate's subgroup among the active subgroups.
+                    candidate_pos = sg_gid[:n_members][candidate_mask] - sg_head
+                    candidate_dt = dt_all[candidate_mask]
 
-                candidate_x = np.array(sg["x"])[candidate_mask]
-                candidate_y = np.array(sg["y"])[candidate_mask]
-                candidate_z = np.array(sg["z"])[candidate_mask]
-                candidate_dt = dt_all[candidate_mask]
+                    dx = sg_x[:n_members][candidate_mask] - event_x
+                    dy = sg_y[:n_members][candidate_mask] - event_y
+                    dz = sg_z[:n_members][candidate_mask] - event_z
+                    distances_squared = dx * dx + dy * dy + dz * dz
 
-                dx = candidate_x - event_x
-                dy = candidate_y - event_y
-                dz = candidate_z - event_z
-                distances_squared = dx * dx + dy * dy + dz * dz
-
-                if np.any(distances_squared <= max_dist_squared):
                     # Check speed constraints.
                     candidate_dt_squared = candidate_dt * candidate_dt
                     dt_squared = np.where(candidate_dt_squared < 1e-5, 1e-5, candidate_dt_squared)
                     speeds_squared = distances_squared / dt_squared
 
-                    if np.any((speeds_squared >= min_speed_squared) & (speeds_squared <= max_speed_squared)):
-                        if event_unix - sg_unix[0] <= max_lightning_duration:
-                            sg["indices"].append(j)
-                            # Use list append rather than np.concatenate.
-                            sg["x"].append(event_x)
-                            sg["y"].append(event_y)
-                            sg["z"].append(event_z)
-                            sg["unix"].append(event_unix)
-                            found = True
-                            break
+                    # A subgroup matches when any of its candidates is close enough and any has a valid speed.
+                    dist_hits = np.bincount(candidate_pos, weights=distances_squared <= max_dist_squared, minlength=next_id - sg_head)
+                    speed_hits = np.bincount(
+                        candidate_pos,
+                        weights=(speeds_squared >= min_speed_squared) & (speeds_squared <= max_speed_squared),
+                        minlength=next_id - sg_head,
+                    )
+                    matched = (dist_hits > 0) & (speed_hits > 0)
+                    if np.any(matched):
+                        # Take the oldest matching subgroup.
+                        sg_id = sg_head + int(np.argmax(matched))
+                        sg_len[sg_id] += 1
+                        found = True
 
             if not found:
-                # Start a new subgroup with list storage.
-                sub_groups.append({
-                    "indices": [j],
-                    "x": [event_x],
-                    "y": [event_y],
-                    "z": [event_z],
-                    "unix": [event_unix],
-                })
+                # Start a new subgroup.
+                sg_id = next_id
+                next_id += 1
+                sg_start_t[sg_id] = event_unix
+                sg_len[sg_id] = 1
+
+            if n_members == capacity:
+                capacity *= 2
+                sg_x, sg_y, sg_z, sg_t, sg_j, sg_gid = (
+                    _grow(arr, capacity) for arr in (sg_x, sg_y, sg_z, sg_t, sg_j, sg_gid)
+                )
+            sg_x[n_members] = event_x
+            sg_y[n_members] = event_y
+            sg_z[n_members] = event_z
+            sg_t[n_members] = event_unix
+            sg_j[n_members] = j
+            sg_gid[n_members] = sg_id
+            n_members += 1
 
         # Finalize any remaining valid subgroups.
-        for sg in sub_groups:
-            if len(sg["indices"]) >= min_pts:
-                final_subgroup = np.array([group_indices[idx] for idx in sg["indices"]], dtype=np.uint32)
-                lightning_strikes.append(final_subgroup)
+        member_gid = sg_gid[:n_members]
+        member_j = sg_j[:n_members]
+        for sg_id in range(sg_head, next_id):
+            if sg_len[sg_id] < min_pts:
+                continue
+            lightning_strikes.append(group_indices[member_j[member_gid == sg_id]])
 
     return lightning_strikes
 
@@ -194,35 +367,51 @@ def _bucket_dataframe_lightnings(
     time_groups = np.concatenate(
         (
             np.array([0], dtype=np.int32),
-            np.cumsum((delta_t > max_time_threshold).astype(np.int32)),
+            np.cumsum(delta_t > max_time_threshold, dtype=np.int32),
         )
     )
     tprint(time_groups)
     tprint("Processing the buckets.")
 
     group_ids = time_groups
-    group_counter = Counter(group_ids)
 
-    chunks = list(toolbox.chunk_items(group_counter, MAX_CHUNK_SIZE))
+    # Group ids come from a cumulative sum over sorted times, so each group is a contiguous range
+    # of events and its bounds can be found in a single pass.
+    num_events = len(time_unix_array)
+    boundaries = np.flatnonzero(np.diff(group_ids)) + 1
+    group_starts = np.concatenate(([0], boundaries)).astype(np.int32)
+    group_ends = np.concatenate((boundaries, [num_events])).astype(np.int32)
 
-    all_x_values = df["x"].values
-    all_y_values = df["y"].values
-    all_z_values = df["z"].values
-    all_unix_values = df["time_unix"].values
+    # Split the groups into consecutive chunks of roughly MAX_CHUNK_SIZE events. group_ends is the
+    # running event count, so the cut points are found with a binary search.
+    num_groups = len(group_ends)
+    cuts = np.searchsorted(group_ends, np.arange(MAX_CHUNK_SIZE, num_events, MAX_CHUNK_SIZE), side="right")
+    cuts = np.unique(cuts[(cuts > 0) & (cuts < num_groups)])
+    chunks = np.split(np.arange(num_groups, dtype=np.int32), cuts)
 
     shutdown_event = multiprocessing.Event()
 
+    # Parallel workers read the event columns from shared memory instead of having them pickled into every chunk.
+    use_pool = NUM_CORES > 1
+    columns = None if use_pool else (df["x"].values, df["y"].values, df["z"].values, df["time_unix"].values)
+
     args_list = [
-        (all_x_values, all_y_values, all_z_values, all_unix_values, chunk, min_pts, group_ids, max_lightning_duration, max_dist_between_pts, max_time_threshold, min_speed, max_speed)
+        (columns, group_starts[chunk], group_ends[chunk], min_pts, max_lightning_duration, max_dist_between_pts, max_time_threshold, min_speed, max_speed)
         for chunk in chunks
     ]
 
     try:
         lightning_strikes: List[List[int]] = []
-        if NUM_CORES > 1:
-            with multiprocessing.Pool(processes=NUM_CORES, initializer=init_worker, initargs=(shutdown_event,)) as pool:
-                for result in tqdm(pool.imap(_group_process, iterable=args_list), desc="Processing Chunks of Buckets",total=len(args_list)):
-                    lightning_strikes += result
+        if use_pool:
+            shared_columns = np.vstack([df[col].to_numpy(dtype=np.float64) for col in ("x", "y", "z", "time_unix")])
+            shm = accelerators.create_shared_array(shared_columns)
+            try:
+                with multiprocessing.Pool(processes=NUM_CORES, initializer=init_worker, initargs=(shutdown_event, shm.name, shared_columns.shape)) as pool:
+                    for result in tqdm(pool.imap(_group_process, iterable=args_list), desc="Processing Chunks of Buckets",total=len(args_list)):
+                        lightning_strikes += result
+            finally:
+                shm.close()
+                shm.unlink()
         else:
             for args in tqdm(args_list, desc="Processing Chunks of Buckets", total=len(args_list)):
                 lightning_strikes += _group_process(args)
@@ -243,81 +432,147 @@ def _compute_cache_key(df: pd.DataFrame, params: dict) -> str:
       - DataFrame shape.
       - Minimum and maximum 'time_unix' values.
       - Sorted bucketing parameters.
+
+    Once the DataFrame is sorted by 'time_unix' (as _bucket_dataframe_lightnings leaves it), the
+    minimum and maximum are read from the first and last rows instead of scanning the column.
       
     Parameters:
       df (pd.DataFrame): DataFrame containing lightning event data.
       params (dict): Bucketing parameters.
       
     Returns:
-      str: MD5 hash representing the unique cache key.
+      str: BLAKE2b hash representing the unique cache key.
     """
-    key_str = f"{df.shape}_{df['time_unix'].min()}_{df['time_unix'].max()}_{sorted(params.items())}"
-    return hashlib.md5(key_str.encode("utf-8")).hexdigest()
+    time_unix = df["time_unix"]
+    if len(time_unix) == 0:
+        start_time, end_time = float("nan"), float("nan")
+    elif time_unix.is_monotonic_increasing:
+        start_time, end_time = float(time_unix.iloc[0]), float(time_unix.iloc[-1])
+    else:
+        start_time, end_time = float(time_unix.min()), float(time_unix.max())
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(df.shape).encode("utf-8"))
+    hasher.update(struct.pack("dd", start_time, end_time))
+    hasher.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _result_cache_path(key: str) -> str:
+    """
+    Return the path of the cache file holding the result for the given cache key.
+    """
+    return os.path.join(RESULT_CACHE_DIR, f"{key}.npz")
+
+
+def _pack_ragged(items: list, row_shape: Tuple[int, ...] = ()) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten a list of index sequences into one int32 array plus CSR style offsets.
+
+    Parameters:
+      items (list): List of sequences (e.g., strike indices, or (parent, child) correlation pairs).
+      row_shape (Tuple[int, ...]): Shape of a single element of a sequence, e.g. (2,) for correlation pairs.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: The concatenated values and the offsets, where sequence i is
+      values[offsets[i]:offsets[i + 1]].
+    """
+    arrays = [np.asarray(item, dtype=np.int32).reshape((-1,) + row_shape) for item in items]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(arr) for arr in arrays])
+    if arrays:
+        values = np.concatenate(arrays)
+    else:
+        values = np.empty((0,) + row_shape, dtype=np.int32)
+    return values, offsets
 
 
 def delete_result_cache() -> None:
     """
-    Delete the cached result file from the filesystem.
+    Delete the cached result directory from the filesystem.
     """
-    if os.path.exists(RESULT_CACHE_FILE):
-        os.remove(RESULT_CACHE_FILE)
+    if os.path.exists(RESULT_CACHE_DIR):
+        shutil.rmtree(RESULT_CACHE_DIR)
 
 
 def _get_result_cache(
     df: pd.DataFrame, params: dict
-) -> Optional[Tuple[List[List[int]], List[Tuple[int, int]], datetime.datetime]]:
+) -> Optional[Tuple[List[List[int]], List[np.ndarray], datetime.datetime]]:
     key = _compute_cache_key(df, params)
     max_cache_life_days = params.get("max_cache_life_days", 30)
-    if os.path.exists(RESULT_CACHE_FILE):
+    cache_path = _result_cache_path(key)
+    if os.path.exists(cache_path):
         try:
-            with open(RESULT_CACHE_FILE, "rb") as f:
-                cache = pkl.load(f)
-            if key in cache:
-                filtered_groups, bucketed_correlations, time_saved = cache[key]
+            with np.load(cache_path) as cache:
+                time_saved = datetime.datetime.fromtimestamp(float(cache["time_saved"]), tz=datetime.timezone.utc)
                 now = datetime.datetime.now(tz=datetime.timezone.utc)
                 if now - time_saved > datetime.timedelta(days=max_cache_life_days):
-                    tprint("Cached result expired. Removing outdated cache entry.")
-                    # Remove the expired cache entry and update the file.
-                    del cache[key]
-                    with open(RESULT_CACHE_FILE, "wb") as f:
-                        pkl.dump(cache, f)
-                    return None
+                    expired = True
                 else:
-                    tprint("Cache hit.")
-                    return cache[key]
+                    expired = False
+                    groups, group_offsets = cache["groups"], cache["group_offsets"]
+                    correlations, correlation_offsets = cache["correlations"], cache["correlation_offsets"]
+
+            if expired:
+                tprint("Cached result expired. Removing outdated cache entry.")
+                # Remove the expired cache entry.
+                os.remove(cache_path)
+                return None
+
+            filtered_groups = [
+                groups[group_offsets[i]:group_offsets[i + 1]].tolist()
+                for i in range(len(group_offsets) - 1)
+            ]
+            bucketed_correlations = [
+                correlations[correlation_offsets[i]:correlation_offsets[i + 1]]
+                for i in range(len(correlation_offsets) - 1)
+            ]
+            tprint("Cache hit.")
+            return filtered_groups, bucketed_correlations, time_saved
         except Exception as e:
             tprint(f"Cache load error: {e}")
     return None
 
 
 def save_result_cache(
-    df: pd.DataFrame, params: dict, result: Tuple[List[List[int]], List[Tuple[int, int]]]
+    df: pd.DataFrame, params: dict, result: Tuple[List[List[int]], List[np.ndarray], datetime.datetime]
 ) -> None:
     """
     Save the bucketing result in the cache with the computed key.
+
+    Every key is stored in its own .npz file under RESULT_CACHE_DIR, so saving a result only
+    writes that result instead of rewriting every cached entry.
     
     Parameters:
       df (pd.DataFrame): DataFrame containing lightning event data.
       params (dict): Bucketing parameters.
-      result (Tuple[List[List[int]], List[Tuple[int, int]]]): The bucketing result to be cached.
+      result (Tuple[List[List[int]], List[np.ndarray], datetime.datetime]): The bucketing result to be cached,
+        along with the time it was computed. The correlations hold one (E, 2) int32 array per cluster.
     """
     key = _compute_cache_key(df, params)
-    cache = {}
-    if os.path.exists(RESULT_CACHE_FILE):
-        try:
-            with open(RESULT_CACHE_FILE, "rb") as f:
-                cache = pkl.load(f)
-        except Exception as e:
-            tprint(f"Cache load error: {e}")
-            cache = {}
-    cache[key] = result
-    with open(RESULT_CACHE_FILE, "wb") as f:
-        pkl.dump(cache, f)
+    filtered_groups, bucketed_correlations, time_saved = result
+    groups, group_offsets = _pack_ragged(filtered_groups)
+    correlations, correlation_offsets = _pack_ragged(bucketed_correlations, row_shape=(2,))
+
+    os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+    cache_path = _result_cache_path(key)
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(
+            f,
+            groups=groups,
+            group_offsets=group_offsets,
+            correlations=correlations,
+            correlation_offsets=correlation_offsets,
+            time_saved=np.float64(time_saved.timestamp()),
+        )
+    # Replace atomically so an interrupted save never leaves a truncated entry behind.
+    os.replace(temp_path, cache_path)
 
 
 def bucket_dataframe_lightnings(
     df: pd.DataFrame, params: dict
-) -> Tuple[List[List[int]], List[Tuple[int, int]]]:
+) -> Tuple[List[List[int]], List[np.ndarray]]:
     """
     Bucket lightning strikes in the dataframe using provided temporal and spatial parameters.
     
@@ -340,9 +595,9 @@ def bucket_dataframe_lightnings(
       params (dict): Additional keyword arguments for bucketing behavior.
       
     Returns:
-      Tuple[List[List[int]], List[Tuple[int, int]]]: A tuple containing:
+      Tuple[List[List[int]], List[np.ndarray]]: A tuple containing:
          - A list of lightning strike clusters (each is a list of event indices).
-         - A list of correlations between event indices.
+         - One (E, 2) int32 array of (parent, child) correlations per cluster.
     """
     use_cache = params.get("cache_results", False)
 
@@ -370,10 +625,9 @@ def bucket_dataframe_lightnings(
 
     filtered_groups: List[List[int]] = []
 
-    # Gather unique indices from correlations.
+    # Gather unique indices from correlations. tolist() yields Python ints, matching the cache path.
     for correlations in bucketed_correlations:
-        unique_indices_set = {idx for pair in correlations for idx in pair}
-        unique_indices = list(unique_indices_set)
+        unique_indices = list(set(correlations.ravel().tolist()))
 
         filtered_groups.append(unique_indices)
 
@@ -396,10 +650,15 @@ def export_as_csv(bucketed_strike_indices: List[List[int]], events: pd.DataFrame
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    all_times = events["time_unix"].to_numpy()
     for indices in bucketed_strike_indices:
-        # Extract events corresponding to the lightning strike and sort by time.
-        strike_df = events.iloc[indices].sort_values(by="time_unix")
-        start_time_unix = strike_df.iloc[0]["time_unix"]
+        if len(indices) == 0:
+            continue
+        # Extract events corresponding to the lightning strike and sort by time. Sorting the positions
+        # with argsort before a single iloc is cheaper than sort_values on the gathered frame.
+        indices = np.asarray(indices, dtype=np.int64)
+        strike = indices[np.argsort(all_times[indices], kind="stable")]
+        start_time_unix = all_times[strike[0]]
         start_time_dt = datetime.datetime.fromtimestamp(
             start_time_unix, tz=datetime.timezone.utc
         ).strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -411,5 +670,5 @@ def export_as_csv(bucketed_strike_indices: List[List[int]], events: pd.DataFrame
             output_filename = os.path.join(output_dir, f"{safe_start_time}_{counter}.csv")
             counter += 1
 
-        strike_df.to_csv(output_filename, index=False)
+        events.iloc[strike].to_csv(output_filename, index=False)
         tprint(f"Exported lightning strike CSV to {output_filename}")
@@ -1,7 +1,90 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple
 from tqdm import tqdm
+import multiprocessing
+from scipy.spatial import cKDTree
+from . import accelerators
+from .accelerators import njit
+
+# Time windows with more candidates than this are searched through a KD-tree of the strike instead of a linear scan.
+KDTREE_MIN_WINDOW = 32
+# Number of nearest neighbors queried per event when the KD-tree is used.
+KDTREE_NEIGHBORS = 16
+
+# Number of processes used to stitch the buckets in parallel.
+STITCH_NUM_CORES = 1
+
+# Columns of the events DataFrame needed for stitching, as shared with the worker processes.
+_STITCH_COLUMNS = ["time_unix", "x", "y", "z"]
+
+worker_events = None
+worker_events_shm = None
+
+def init_stitch_worker(shm_name, shape):
+    """
+    Attach a stitching worker to the shared event columns and wrap them in a DataFrame.
+    """
+    global worker_events, worker_events_shm
+    worker_events_shm, columns = accelerators.attach_shared_array(shm_name, shape, np.float64)
+    worker_events = pd.DataFrame(columns, columns=_STITCH_COLUMNS, copy=False)
+
+def _stitch_process(args):
+    """
+    Stitch a single bucket inside a worker process.
+
+    Parameters:
+      args: Tuple of (bucket position, strike indices, params).
+
+    Returns:
+      Tuple of (bucket position, correlations).
+    """
+    position, strike_indices, params = args
+    return position, stitch_lightning_strike(strike_indices, worker_events, params)
+
+
+@njit(cache=True)
+def _find(parents, node):
+    """
+    Return the root of node in the union-find forest, compressing the path along the way.
+    """
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+    while parents[node] != root:
+        next_node = parents[node]
+        parents[node] = root
+        node = next_node
+    return root
+
+
+@njit(cache=True)
+def _union_find(parents, ranks, edges):
+    """
+    Union the endpoints of every edge (union by rank with path compression).
+
+    Parameters:
+      parents (np.ndarray): int64 parent array, initialized to arange(num_nodes).
+      ranks (np.ndarray): int64 rank array, initialized to zeros.
+      edges (np.ndarray): int64 array of shape (E, 2) holding dense node labels.
+
+    Returns:
+      np.ndarray: The root label of every node.
+    """
+    for e in range(edges.shape[0]):
+        a = _find(parents, edges[e, 0])
+        b = _find(parents, edges[e, 1])
+        if a == b:
+            continue
+        if ranks[a] < ranks[b]:
+            a, b = b, a
+        parents[b] = a
+        if ranks[a] == ranks[b]:
+            ranks[a] += 1
+
+    roots = np.empty_like(parents)
+    for node in range(parents.shape[0]):
+        roots[node] = _find(parents, node)
+    return roots
 
 
 def filter_correlations_by_chain_size(correlations, min_pts, filter_point_to_self: bool = True):
@@ -9,18 +92,45 @@ def filter_correlations_by_chain_size(correlations, min_pts, filter_point_to_sel
     Filter out correlations that do not belong to a connected chain with at least min_pts nodes.
     
     This function builds an undirected graph where each correlation (parent, child)
-    represents an edge. It then uses depth-first search (DFS) to identify connected
-    components. Only nodes within components that have at least min_pts nodes are considered valid.
+    represents an edge. It then identifies connected components, using a Numba union-find
+    kernel when numba is available and depth-first search (DFS) otherwise. Only nodes within
+    components that have at least min_pts nodes are considered valid.
     
     Parameters:
-      correlations: List of tuples (parent, child) representing connections between events.
+      correlations: List of tuples (parent, child), or an (E, 2) integer array, representing connections between events.
       min_pts: Minimum number of nodes required for a chain to be considered valid.
       
     Returns:
-      A list of filtered correlations where both nodes belong to a valid chain.
+      The filtered correlations where both nodes belong to a valid chain, as an (E, 2) array
+      if correlations is an array and as a list of tuples otherwise.
     """
+    is_array = isinstance(correlations, np.ndarray)
+    if len(correlations) == 0:
+        return correlations[:0] if is_array else []
+
+    if accelerators.NUMBA_AVAILABLE:
+        corr_array = np.asarray(correlations, dtype=np.int64).reshape(-1, 2)
+
+        # Remap the event indices to dense labels 0..K-1.
+        nodes, labels = np.unique(corr_array.ravel(), return_inverse=True)
+        labels = labels.reshape(-1, 2).astype(np.int64)
+
+        parents = np.arange(len(nodes), dtype=np.int64)
+        ranks = np.zeros(len(nodes), dtype=np.int64)
+        roots = _union_find(parents, ranks, labels)
+
+        # A node is valid when its component has at least min_pts nodes.
+        component_sizes = np.bincount(roots)
+        valid_mask = component_sizes[roots] >= min_pts
+
+        keep = valid_mask[labels[:, 0]] & valid_mask[labels[:, 1]] & (filter_point_to_self & (corr_array[:, 0] != corr_array[:, 1]))
+        if is_array:
+            return correlations[keep]
+        return [corr for corr, is_kept in zip(correlations, keep) if is_kept]
 
     # Build an undirected graph from the correlations.
+    if is_array:
+        correlations = correlations.tolist()
     graph = {}
     for parent, child in correlations:
         graph.setdefault(parent, set()).add(child)
@@ -44,10 +154,159 @@ def filter_correlations_by_chain_size(correlations, min_pts, filter_point_to_sel
                 valid_nodes |= component
     
     # Filter correlations: both parent and child must be in a valid chain.
-    return [(p, c) for (p, c) in correlations if p in valid_nodes and c in valid_nodes and (filter_point_to_self and p != c)]
+    filtered = [(p, c) for (p, c) in correlations if p in valid_nodes and c in valid_nodes and (filter_point_to_self and p != c)]
+    if is_array:
+        return np.asarray(filtered, dtype=np.int32).reshape(-1, 2)
+    return filtered
+
+
+def _closest_valid_candidate(candidates, x1, y1, z1, current_time, all_x, all_y, all_z, all_times, thresholds):
+    """
+    Find the closest preceding point that satisfies the distance, speed, and time thresholds.
+
+    Parameters:
+      candidates (np.ndarray): Ascending positions (into all_x, all_y, all_z, all_times) of the points to check.
+      x1, y1, z1 (float): Coordinates of the current point.
+      current_time (float): Unix timestamp of the current point.
+      all_x, all_y, all_z, all_times (np.ndarray): Coordinates and timestamps of the strike, sorted by time.
+      thresholds (tuple): Squared (max distance, max speed, min speed, max time difference) thresholds.
+
+    Returns:
+      Tuple[int, float]: The position of the closest valid candidate (the earliest one on ties) and its
+      squared distance, or (-1, inf) if no candidate is valid.
+    """
+    max_dist_squared, max_speed_squared, min_speed_squared, max_time_threshold_squared = thresholds
+
+    # Compute squared Euclidean distances.
+    # We don't sqrt for optimization purposes.
+    # We just do our math in squareds
+    dx = all_x[candidates] - x1
+    dy = all_y[candidates] - y1
+    dz = all_z[candidates] - z1
+    distances_squared = dx * dx + dy * dy + dz * dz
+
+    # Compute time differences (seconds).
+    dt = current_time - all_times[candidates]
+
+    dt_squared = (dt * dt)
+    dt_squared = np.where(dt_squared < 1e-5, 1e-5, dt_squared)  # Avoid divide-by-zero
+
+    # Compute squared speeds (m²/s²).
+    speeds_squared = distances_squared / dt_squared
+
+    # Apply filtering mask using squared comparisons.
+    mask = (distances_squared <= max_dist_squared)
+    mask &= (speeds_squared <= max_speed_squared) 
+    mask &= (speeds_squared >= min_speed_squared)
+    mask &= (dt_squared <= max_time_threshold_squared)
+
+    valid_indices = np.where(mask)[0]
 
+    if valid_indices.size == 0:
+        return -1, np.inf
 
-def stitch_lightning_strike(strike_indeces: list[int], events: pd.DataFrame, params: dict) -> list[Tuple[(int, int)]]:
+    # Select the candidate with the minimum distance among those valid.
+    valid_distances_squared = distances_squared[valid_indices]
+    min_valid_idx = int(np.argmin(valid_distances_squared))
+    return int(candidates[valid_indices[min_valid_idx]]), float(valid_distances_squared[min_valid_idx])
+
+
+def _stitch_correlations(strike_indeces: list[int], events: pd.DataFrame, params: dict) -> np.ndarray:
+    """
+    Connect each strike to the closest valid preceding strike, without filtering by chain size.
+
+    See stitch_lightning_strike for the parameters.
+
+    Returns:
+      np.ndarray: int32 array of shape (E, 2) with a (parent_index, child_index) row for every strike that found a parent.
+    """
+    # Retrieve filtering parameters.
+    max_time_threshold = params.get("max_lightning_time_threshold", 1)
+    max_dist_between_pts = params.get("max_lightning_dist", 50000)
+    max_speed = params.get("max_lightning_speed", 299792.458)
+    min_speed = params.get("min_lightning_speed", 0)
+
+
+    # Sort the strike indices chronologically (using "time_unix"). A stable sort keeps ties in their given order.
+    event_times = events["time_unix"].to_numpy()
+    strike_indeces = np.asarray(strike_indeces, dtype=np.int64)
+    strike_indeces = strike_indeces[np.argsort(event_times[strike_indeces], kind="stable")]
+
+    # Cache the arrays for the data columns (a single gather per column, no intermediate DataFrame).
+    all_x = events["x"].to_numpy()[strike_indeces]
+    all_y = events["y"].to_numpy()[strike_indeces]
+    all_z = events["z"].to_numpy()[strike_indeces]
+    all_times = event_times[strike_indeces]
+
+    num_strikes = len(strike_indeces)
+
+    # Every strike has at most one parent, so the edges fit in an array of num_strikes rows.
+    edges = np.empty((num_strikes, 2), dtype=np.int32)
+    n_edges = 0
+
+    # Only points within max_time_threshold seconds of an event can be its parent, so with the
+    # events sorted by time the candidates of event i are always a window [window_lo[i], i).
+    # The window is padded by a few ulps; the exact time check is applied on the candidates.
+    window_lo = np.searchsorted(all_times, all_times - max_time_threshold - 4 * np.spacing(np.abs(all_times)), side="left")
+
+    # For large windows, look up the nearest spatial neighbors of every event in a single KD-tree query.
+    nn_dist = nn_idx = None
+    if num_strikes > KDTREE_MIN_WINDOW:
+        coords = np.column_stack((all_x, all_y, all_z))
+        tree = cKDTree(coords)
+        num_neighbors = min(KDTREE_NEIGHBORS, num_strikes)
+        nn_dist, nn_idx = tree.query(
+            coords,
+            k=num_neighbors,
+            distance_upper_bound=max_dist_between_pts * (1 + 1e-9),
+        )
+
+    # Precompute squared thresholds.
+    max_dist_squared = max_dist_between_pts ** 2
+    max_speed_squared = max_speed ** 2
+    min_speed_squared = min_speed ** 2
+    max_time_threshold_squared = max_time_threshold ** 2
+
+    thresholds = (max_dist_squared, max_speed_squared, min_speed_squared, max_time_threshold_squared)
+
+    # The first strike has no preceding strike to connect to.
+    for i in range(1, num_strikes):
+        # Get the current strike's coordinates and time.
+        x1, y1, z1 = all_x[i], all_y[i], all_z[i]
+        current_time = all_times[i]
+        lo = int(window_lo[i])
+
+        candidate_idx = -1
+        resolved = False
+        if nn_idx is not None and i - lo > KDTREE_MIN_WINDOW:
+            # The neighbors are sorted by distance, so the closest valid one among them is the
+            # closest valid parent overall, as long as nothing at least as close was cut off.
+            row = nn_idx[i]
+            candidates = np.sort(row[(row >= lo) & (row < i)])
+            candidate_idx, candidate_dist_squared = _closest_valid_candidate(
+                candidates, x1, y1, z1, current_time, all_x, all_y, all_z, all_times, thresholds
+            )
+            complete = row[-1] == num_strikes  # Fewer than k neighbors within max_dist_between_pts.
+            if complete:
+                resolved = True
+            elif candidate_idx != -1:
+                resolved = candidate_dist_squared < (nn_dist[i, -1] * (1 - 1e-9)) ** 2
+
+        if not resolved:
+            candidates = np.arange(lo, i)
+            candidate_idx, _ = _closest_valid_candidate(
+                candidates, x1, y1, z1, current_time, all_x, all_y, all_z, all_times, thresholds
+            )
+
+        if candidate_idx != -1:
+            edges[n_edges, 0] = strike_indeces[candidate_idx]
+            edges[n_edges, 1] = strike_indeces[i]
+            n_edges += 1
+
+    return edges[:n_edges]
+
+
+def stitch_lightning_strike(strike_indeces: list[int], events: pd.DataFrame, params: dict) -> np.ndarray:
     """
     Build a chain of lightning strike nodes by connecting each strike to the closest preceding strike,
     subject to thresholds on time difference, spatial distance, and speed.
@@ -63,97 +322,75 @@ def stitch_lightning_strike(strike_indeces: list[int], events: pd.DataFrame, par
           - min_lightning_points (int): Minimum number of points required for a valid lightning strike chain (default: 300).
     
     Returns:
-      List of tuples (parent_index, child_index) representing valid correlations between lightning strike events.
+      np.ndarray: int32 array of shape (E, 2) whose rows (parent_index, child_index) are the valid
+      correlations between lightning strike events.
     """
-    # Retrieve filtering parameters.
-    max_time_threshold = params.get("max_lightning_time_threshold", 1)
-    max_dist_between_pts = params.get("max_lightning_dist", 50000)
-    max_speed = params.get("max_lightning_speed", 299792.458)
-    min_speed = params.get("min_lightning_speed", 0)
     min_pts = params.get("min_lightning_points", 300)
 
+    correlations = _stitch_correlations(strike_indeces, events, params)
 
-    # Sort the strike indices chronologically (using "time_unix").
-    strike_indeces: list[int] = sorted(strike_indeces, key=lambda idx: events.loc[idx, "time_unix"])
-    
-
-    # Create a Series DataFrame for only the selected strikes.
-    strike_series_df: pd.DataFrame = events.iloc[strike_indeces]
-
-    # Cache the cupy arrays for the data columns.
-    all_x = np.array(strike_series_df["x"].values)
-    all_y = np.array(strike_series_df["y"].values)
-    all_z = np.array(strike_series_df["z"].values)
-    all_times = np.array(strike_series_df["time_unix"].values)
-
-    # List to store nodes corresponding to each strike.
-    parsed_indices: list[int] = []
-    correlations: list[Tuple[(int, int)]] = []
-
-    for i in range(len(strike_indeces)):
-        current_indice = strike_indeces[i]
-
-        if len(parsed_indices) > 0:
-            # Get the current strike's coordinates and time.
-            x1, y1, z1 = all_x[i], all_y[i], all_z[i]
-            current_time = all_times[i]
-
-            x_pre = all_x[:i]
-            y_pre = all_y[:i]
-            z_pre = all_z[:i]
-            times_pre = all_times[:i]
-            current_coords = np.array([x1, y1, z1])
+    # Filter out correlations that are not connected to a lightning strike that contains min_pts pts
+    correlations_filtered = filter_correlations_by_chain_size(correlations, min_pts, filter_point_to_self=True)
 
-            # Compute squared Euclidean distances.
-            # We don't sqrt for optimization purposes.
-            # We just do our math in squareds
-            dx = x_pre - current_coords[0]
-            dy = y_pre - current_coords[1]
-            dz = z_pre - current_coords[2]
-            distances_squared = dx * dx + dy * dy + dz * dz
+    return correlations_filtered
 
-            # Compute time differences (seconds).
-            dt = current_time - times_pre
 
-            dt_squared = (dt * dt)
-            dt_squared = np.where(dt_squared < 1e-5, 1e-5, dt_squared)  # Avoid divide-by-zero
+def _merge_stitched_correlations(temp_corr: np.ndarray, new_corr: np.ndarray, events: pd.DataFrame, params: dict) -> np.ndarray:
+    """
+    Merge two already stitched groups, re-stitching only the boundary between them.
 
-            # Compute squared speeds (m²/s²).
-            speeds_squared = distances_squared / dt_squared
+    Only the nodes of either group that lie within max_lightning_time_threshold of the time span shared by
+    both groups can connect across them, so only those "bridge" nodes are stitched again. A bridge node whose
+    closest valid parent belongs to the other group takes that parent. Every other node keeps its current one.
+    The result is filtered by chain size once.
 
-            # Precompute squared thresholds.
-            max_dist_squared = max_dist_between_pts ** 2
-            max_speed_squared = max_speed ** 2
-            min_speed_squared = min_speed ** 2
-            max_time_threshold_squared = max_time_threshold ** 2
+    This reproduces a full re-stitch of the union, provided the two groups share no nodes: any cross-group
+    candidate of a node lies in the bridge window [max(min) - threshold, min(max) + threshold], so a node
+    whose closest valid parent in the union is in the other group is always a bridge node, and every other
+    node's closest valid parent is the one it already has within its own group. Do not widen this into a
+    full re-stitch; it is exact, not a heuristic.
 
-            # Apply filtering mask using squared comparisons.
-            mask = (distances_squared <= max_dist_squared)
-            mask &= (speeds_squared <= max_speed_squared) 
-            mask &= (speeds_squared >= min_speed_squared)
-            mask &= (dt_squared <= max_time_threshold_squared)
+    Parameters:
+      temp_corr (np.ndarray): (E, 2) int32 correlations of the existing group.
+      new_corr (np.ndarray): (E, 2) int32 correlations of the group being merged into it.
+      events (pd.DataFrame): DataFrame containing event data.
+      params (dict): Stitching parameters (see stitch_lightning_strike).
 
-            valid_indices = np.where(mask)[0]
+    Returns:
+      np.ndarray: (E, 2) int32 array of (parent_index, child_index) rows for the merged group.
+    """
+    max_time_threshold = params.get("max_lightning_time_threshold", 1)
+    min_pts = params.get("min_lightning_points", 300)
+    all_times = events["time_unix"].to_numpy()
 
-            if valid_indices.size > 0:
-                # Select the candidate with the minimum distance among those valid.
-                valid_distances_squared = distances_squared[valid_indices]
-                min_valid_idx = int(np.argmin(valid_distances_squared))
-                candidate_idx = int(valid_indices[min_valid_idx])
-                parent_indice = parsed_indices[candidate_idx]
+    temp_nodes = np.unique(temp_corr)
+    new_nodes = np.unique(new_corr)
+    temp_times = all_times[temp_nodes]
+    new_times = all_times[new_nodes]
 
-                correlations.append((parent_indice, current_indice))
+    bridge_start = max(temp_times.min(), new_times.min()) - max_time_threshold
+    bridge_end = min(temp_times.max(), new_times.max()) + max_time_threshold
+    bridge_nodes = np.concatenate((
+        temp_nodes[(temp_times >= bridge_start) & (temp_times <= bridge_end)],
+        new_nodes[(new_times >= bridge_start) & (new_times <= bridge_end)],
+    ))
 
-        # Save the current node.
-        parsed_indices.append(current_indice)
+    # Every child has a single parent within its own group.
+    parents = {child: parent for parent, child in temp_corr.tolist()}
+    parents.update({child: parent for parent, child in new_corr.tolist()})
 
-    # Filter out correlations that are not connected to a lightning strike that contains min_pts pts
-    correlations_filtered = filter_correlations_by_chain_size(correlations, min_pts, filter_point_to_self=True)
+    temp_node_set = set(temp_nodes.tolist())
+    for parent, child in _stitch_correlations(bridge_nodes, events, params).tolist():
+        if (parent in temp_node_set) != (child in temp_node_set):
+            parents[child] = parent
 
-    return correlations_filtered
+    merged = np.empty((len(parents), 2), dtype=np.int32)
+    merged[:, 0] = list(parents.values())
+    merged[:, 1] = list(parents.keys())
+    return filter_correlations_by_chain_size(merged, min_pts, filter_point_to_self=True)
 
 
-def stitch_lightning_strikes(bucketed_strike_indices: list[list[int]], events: pd.DataFrame, params: dict) -> list[list[Tuple[int, int]]]:
+def stitch_lightning_strikes(bucketed_strike_indices: list[list[int]], events: pd.DataFrame, params: dict) -> list[np.ndarray]:
     """
     Process multiple groups of lightning strike indices and generate correlations for each group.
     
@@ -171,14 +408,28 @@ def stitch_lightning_strikes(bucketed_strike_indices: list[list[int]], events: p
           - intercepting_times_extension_max_distance (float): Maximum allowed distance (in meters) for intercepting groups (default: 15000).
     
     Returns:
-      A list (one element per input group) where each element is a list of tuples (parent_index, child_index)
-      representing correlations between lightning strike events.
+      A list (one element per input group) where each element is an (E, 2) int32 array of
+      (parent_index, child_index) rows representing correlations between lightning strike events.
     """
     # First, compute correlations for each strike group.
     bucketed_correlations = []
-    for strike_indices in tqdm(bucketed_strike_indices, desc="Stitching Lightning Strikes", total=len(bucketed_strike_indices)):
-        correlations = stitch_lightning_strike(strike_indices, events, params)
-        bucketed_correlations.append(correlations)
+    if STITCH_NUM_CORES > 1 and len(bucketed_strike_indices) > 1:
+        # Share only the needed columns with the workers once, instead of pickling the DataFrame per bucket.
+        columns = np.column_stack([events[col].to_numpy(dtype=np.float64) for col in _STITCH_COLUMNS])
+        shm = accelerators.create_shared_array(columns)
+        try:
+            args_list = [(i, strike_indices, params) for i, strike_indices in enumerate(bucketed_strike_indices)]
+            bucketed_correlations = [None] * len(args_list)
+            with multiprocessing.Pool(processes=STITCH_NUM_CORES, initializer=init_stitch_worker, initargs=(shm.name, columns.shape)) as pool:
+                for position, correlations in tqdm(pool.imap_unordered(_stitch_process, args_list), desc="Stitching Lightning Strikes", total=len(args_list)):
+                    bucketed_correlations[position] = correlations
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        for strike_indices in tqdm(bucketed_strike_indices, desc="Stitching Lightning Strikes", total=len(bucketed_strike_indices)):
+            correlations = stitch_lightning_strike(strike_indices, events, params)
+            bucketed_correlations.append(correlations)
     
     # Retrieve combining parameters.
     combine = params.get("combine_strikes_with_intercepting_times", True)
@@ -195,56 +446,81 @@ def stitch_lightning_strikes(bucketed_strike_indices: list[list[int]], events: p
 
     if combine:
         temp_bucketed_correlations = []
-        for correlations in tqdm(bucketed_correlations, desc="Grouping Intercepting Lightning Strikes", total=len(bucketed_correlations)):
+
+        # Time window of each temp group, indexed like temp_bucketed_correlations, so a new group
+        # is checked against all of them at once. There is at most one temp group per input group.
+        temp_starts = np.empty(len(bucketed_correlations), dtype=np.float64)
+        temp_ends = np.empty(len(bucketed_correlations), dtype=np.float64)
+
+        # Sort every group's correlations by the parent's event time, and record the group's first
+        # parent and last child, which give its time interval and starting point.
+        sorted_bucketed_correlations = []
+        bucket_start_idx = np.zeros(len(bucketed_correlations), dtype=np.int64)
+        bucket_end_idx = np.zeros(len(bucketed_correlations), dtype=np.int64)
+        for b, correlations in enumerate(bucketed_correlations):
             if len(correlations) == 0:
+                sorted_bucketed_correlations.append(correlations)
+                continue
+            order = np.argsort(all_times[correlations[:, 0]], kind="stable")
+            sorted_bucketed_correlations.append(correlations[order])
+            bucket_start_idx[b] = correlations[order[0], 0]
+            bucket_end_idx[b] = correlations[order[-1], 1]
+
+        bucket_start_times = all_times[bucket_start_idx]
+        bucket_end_times = all_times[bucket_end_idx]
+        # Use the coordinates of the starting event for spatial comparisons.
+        bucket_start_x = all_x[bucket_start_idx]
+        bucket_start_y = all_y[bucket_start_idx]
+        bucket_start_z = all_z[bucket_start_idx]
+
+        for b, sorted_corr in enumerate(tqdm(sorted_bucketed_correlations, desc="Grouping Intercepting Lightning Strikes", total=len(sorted_bucketed_correlations))):
+            if len(sorted_corr) == 0:
                 continue
 
-            # Sort correlations by the parent's event time.
-            sorted_corr = sorted(correlations, key=lambda corr: all_times[corr[0]])
-            start_idx = sorted_corr[0][0]
-            end_idx = sorted_corr[-1][-1]
-            start_time = all_times[start_idx]
-            end_time = all_times[end_idx]
-
-            # Use the coordinates of the starting event for spatial comparisons.
-            x1 = all_x[start_idx]
-            y1 = all_y[start_idx]
-            z1 = all_z[start_idx]
-            
+            start_time = bucket_start_times[b]
+            end_time = bucket_end_times[b]
+            x1 = bucket_start_x[b]
+            y1 = bucket_start_y[b]
+            z1 = bucket_start_z[b]
+
+            # Check which existing groups have a time window compatible with the new group.
+            num_temp = len(temp_bucketed_correlations)
+            temp_start = temp_starts[:num_temp]
+            temp_end = temp_ends[:num_temp]
+            within_duration = np.maximum(np.abs(end_time - temp_start), np.abs(start_time - temp_end)) < max_duration
+            intercept_window = (temp_start < start_time) & (start_time < temp_end)
+
             result_found = False
-            for i, temp_corr in enumerate(temp_bucketed_correlations):
-                temp_start = all_times[temp_corr[0][0]]
-                temp_end = all_times[temp_corr[-1][-1]] + ext_buffer
-
-                # Check if the new group's time window is compatible with the existing group.
-                within_duration = (max(abs(end_time - temp_start), abs(start_time - temp_end)) < max_duration)
-                intercept_window = (temp_start < start_time < temp_end)
-
-                if intercept_window and within_duration:
-                    # Merge the groups: gather unique event indices.
-                    unique_idx_set = {idx for pair in temp_corr for idx in pair}
-                    unique_idx_list = list(unique_idx_set)
-                    xs = all_x[unique_idx_list]
-                    ys = all_y[unique_idx_list]
-                    zs = all_z[unique_idx_list]
-
-                    dx = xs - x1
-                    dy = ys - y1
-                    dz = zs - z1
-                    dist_sq = dx * dx + dy * dy + dz * dz
-                    if np.any(dist_sq <= max_distance_sq):
-                        combined_corr = temp_corr + sorted_corr
-                        unique_idx_set = {idx for pair in combined_corr for idx in pair}
-                        unique_idx_list = list(unique_idx_set)
-
-                        # re-stitch with new data
-                        merged = stitch_lightning_strike(unique_idx_list, events, params)
-                        merged = sorted(merged, key=lambda corr: all_times[corr[0]])
-                        temp_bucketed_correlations[i] = merged
-                        result_found = True
-                        break
+            for i in np.flatnonzero(intercept_window & within_duration):
+                temp_corr = temp_bucketed_correlations[i]
+
+                # Merge the groups: gather unique event indices.
+                unique_idx = np.unique(temp_corr)
+                xs = all_x[unique_idx]
+                ys = all_y[unique_idx]
+                zs = all_z[unique_idx]
+
+                dx = xs - x1
+                dy = ys - y1
+                dz = zs - z1
+                dist_sq = dx * dx + dy * dy + dz * dz
+                if np.any(dist_sq <= max_distance_sq):
+                    # Stitch the boundary between both groups.
+                    merged = _merge_stitched_correlations(temp_corr, sorted_corr, events, params)
+                    merged = merged[np.argsort(all_times[merged[:, 0]], kind="stable")]
+                    temp_bucketed_correlations[i] = merged
+                    if len(merged) > 0:
+                        temp_starts[i] = all_times[merged[0, 0]]
+                        temp_ends[i] = all_times[merged[-1, 1]] + ext_buffer
+                    else:
+                        # Nothing survived the re-stitch, so no later group can intercept it.
+                        temp_starts[i] = temp_ends[i] = np.nan
+                    result_found = True
+                    break
             
             if not result_found:
+                temp_starts[num_temp] = start_time
+                temp_ends[num_temp] = end_time + ext_buffer
                 temp_bucketed_correlations.append(sorted_corr)
         bucketed_correlations = temp_bucketed_correlations
 
@@ -5,21 +5,34 @@ import json
 # The file to be used for logging files to determine if a file was modified or new
 LOG_FILE = "file_log.json"
 
+# Size of the blocks read from a file while hashing it
+HASH_CHUNK_SIZE = 1 << 20
+
+# hashlib runs SHA256 through OpenSSL when available, which uses the CPU's SHA extensions (SHA-NI)
+# where present. Otherwise it falls back to CPython's slower builtin implementation.
+SHA256_BACKEND = "openssl" if type(hashlib.sha256()).__module__ == "_hashlib" else "builtin"
+
 
 def _compute_file_hash(path):
     """
     Compute the SHA256 hash of a file's contents.
 
+    The file is hashed with a single hash object, through hashlib.file_digest when available
+    (Python 3.11+) and in blocks of HASH_CHUNK_SIZE bytes otherwise. See SHA256_BACKEND for the
+    implementation in use.
+
     Parameters:
       path (str): The file path to compute the hash for.
 
     Returns:
       str|None: The hexadecimal SHA256 hash if the file exists, or None if the file is not found.
     """
-    hasher = hashlib.sha256()
     try:
         with open(path, "rb") as f:
-            while chunk := f.read(8192):
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            hasher = hashlib.sha256()
+            while chunk := f.read(HASH_CHUNK_SIZE):
                 hasher.update(chunk)
         return hasher.hexdigest()
     except FileNotFoundError:
@@ -1,17 +1,47 @@
+from __future__ import annotations
+
 import os
-import pickle
-import hashlib
-from typing import List, Mapping, Any
-import datetime
+import stat
+import functools
+import struct
+from typing import List, Mapping, Any, Tuple, Optional, TYPE_CHECKING
+import time
 import string
 
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    from math import fma as _fma
+except ImportError:
+    # math.fma was added in Python 3.13. Without it, lerp uses plain multiplies and adds.
+    _fma = None
+
+# Number of CPUs on the system, read once at import.
+_CPU_COUNT = os.cpu_count() or 1
+
+# Version of the directory fingerprint format. Bump it whenever compute_directory_hash changes
+# how the fingerprint is built, so that hashes saved by older versions no longer match.
+DIRECTORY_HASH_VERSION = 2
+
+# Directories with more entries than this are stat'ed in parallel by compute_directory_hash.
+PARALLEL_STAT_MIN_ENTRIES = 512
+
+# zig_zag_range caches the sequences of ranges up to this size. Larger ranges are generated lazily.
+ZIG_ZAG_CACHE_MAX_VALUE = 4096
+
+# The last second printed by tprint and its formatted timestamp.
+_tprint_second = None
+_tprint_timestamp = ""
+
 def tprint(*args: Any, **kwargs: Any) -> None:
     """
     Prints the provided arguments to standard output with a prefixed timestamp.
 
     This function wraps the built-in print function to prepend each output with a
-    timestamp formatted as "[MM-DD-YYYY HH:MM:SS]". It accepts all positional and
-    keyword arguments supported by print.
+    timestamp formatted as "[MM-DD-YYYY HH:MM:SS UTC]". It accepts all positional and
+    keyword arguments supported by print. The formatted timestamp only changes once per
+    second, so it is formatted once per second and reused for every line in between.
 
     Parameters:
         *args: Variable length argument list to be printed.
@@ -23,10 +53,14 @@ def tprint(*args: Any, **kwargs: Any) -> None:
 
     Example:
         >>> tprint("System initialized.")
-        [03-31-2025 12:34:56] System initialized.
+        [03-31-2025 12:34:56 UTC] System initialized.
     """
-    timestamp = datetime.datetime.now(tz=datetime.timezone.utc).strftime("[%m-%d-%Y %H:%M:%S UTC]")
-    print(timestamp, *args, **kwargs)
+    global _tprint_second, _tprint_timestamp
+    second = int(time.time())
+    if second != _tprint_second:
+        _tprint_timestamp = time.strftime("[%m-%d-%Y %H:%M:%S UTC]", time.gmtime(second))
+        _tprint_second = second
+    print(_tprint_timestamp, *args, **kwargs)
 
 def zig_zag_range(max_value: int, start: int):
     """
@@ -65,6 +99,11 @@ def zig_zag_range(max_value: int, start: int):
     if start < 0 or start >= max_value:
         raise ValueError("start must be within the range [0, max_value)")
 
+    if max_value <= ZIG_ZAG_CACHE_MAX_VALUE:
+        yield from _zig_zag_array(max_value, start).tolist()
+        return
+
+    # Large ranges are generated lazily, so a caller that stops early does not pay for the whole sequence.
     yield start
     up_max = max_value - start - 1  # maximum upward steps possible
     down_max = start              # maximum downward steps possible
@@ -86,6 +125,31 @@ def zig_zag_range(max_value: int, start: int):
                 yield start + d
 
 
+@functools.lru_cache(maxsize=64)
+def _zig_zag_array(max_value: int, start: int) -> np.ndarray:
+    """
+    Builds the zig-zag order for (max_value, start) once and caches it for repeated calls.
+
+    Only used for max_value up to ZIG_ZAG_CACHE_MAX_VALUE, which bounds the cache to a few MB.
+
+    Parameters:
+      max_value (int): The exclusive upper bound for indices.
+      start (int): The starting index, which must be within [0, max_value).
+
+    Returns:
+      np.ndarray: A read-only int64 array holding the indices in zig-zag order.
+    """
+    # Imported on use, so that importing toolbox does not load numpy or numba.
+    from . import accelerators
+
+    if accelerators.NUMBA_AVAILABLE:
+        indices = accelerators.zig_zag_indices(max_value, start)
+    else:
+        indices = accelerators.zig_zag_indices_numpy(max_value, start)
+    indices.flags.writeable = False
+    return indices
+
+
 def chunk_items(counter: Mapping[Any, int], max_chunk_size: int):
     """
     Splits items from a counter into chunks based on a maximum allowed sum of counts.
@@ -95,6 +159,9 @@ def chunk_items(counter: Mapping[Any, int], max_chunk_size: int):
     the specified `max_chunk_size`. When adding an item's count would surpass the limit and the current
     chunk is non-empty, the current chunk is yielded and a new chunk is started.
 
+    The counts are expected to be non-negative. Their running total is computed once, and the end of
+    each chunk is then found with a binary search instead of a comparison per item.
+
     Parameters:
       counter (Mapping[Any, int]): A dictionary-like object mapping items to their counts.
       max_chunk_size (int): The maximum allowed sum of counts for each chunk.
@@ -106,45 +173,72 @@ def chunk_items(counter: Mapping[Any, int], max_chunk_size: int):
       >>> from collections import Counter
       >>> counts = Counter({'a': 3, 'b': 2, 'c': 5, 'd': 1})
       >>> list(chunk_items(counts, 5))
-      [['a'], ['b', 'd'], ['c']]
+      [['a', 'b'], ['c'], ['d']]
     """
-    current_bin = []
-    current_size = 0
-    for number, count in counter.items():
-        # If adding this count exceeds the limit and there's already data in current_bin, yield it.
-        if current_bin and current_size + count > max_chunk_size:
-            yield current_bin
-            current_bin = []
-            current_size = 0
-        current_bin.append(number)
-        current_size += count
-    if current_bin:
-        yield current_bin
+    import numpy as np
+
+    keys = list(counter.keys())
+    counts = np.fromiter(counter.values(), dtype=np.int64, count=len(keys))
+    cumulative_counts = np.cumsum(counts)
+
+    start = 0
+    while start < len(keys):
+        base = cumulative_counts[start - 1] if start > 0 else 0
+        # The chunk takes every following item while the sum of counts stays within max_chunk_size,
+        # and always at least one item.
+        end = int(np.searchsorted(cumulative_counts, base + max_chunk_size, side="right"))
+        end = max(end, start + 1)
+        yield keys[start:end]
+        start = end
 
 
 def hash_string_list(string_list: List[str]):
     """
     Generates a unique hash for a list of strings.
 
-    The function concatenates the list of strings using a null character as a delimiter to
-    ensure that the boundaries between strings are preserved, then computes the SHA-256 hash
-    of the resulting single string.
+    The strings are fed to a 256 bit BLAKE2b hash one at a time, separated by a null character
+    to ensure that the boundaries between strings are preserved. This gives the same hash as
+    hashing the joined string, without building it in memory. The hash is only used as a
+    fingerprint for cache invalidation, so BLAKE2b is used over the slower SHA-256.
 
     Parameters:
       string_list (List[str]): A list of strings to be hashed.
 
     Returns:
-      str: A hexadecimal string representing the SHA-256 hash of the concatenated input strings.
+      str: A hexadecimal string representing the BLAKE2b hash of the concatenated input strings.
 
     Example:
       >>> hash_string_list(["hello", "world"])
-      '64ec88ca00b268e5ba1a35678a1b5316d212f4f366b247724e3f0b5a5edb69c6'
+      '62de791dfe6bcf63b71796ceedcb51e631b1ab8fafd9295158342d0e20f0bd36'
+    """
+    import hashlib  # Imported on use, as most users of toolbox never hash anything.
+
+    hasher = hashlib.blake2b(digest_size=32)
+    separator = b'\0'  # Use a delimiter unlikely to appear in strings
+    for i, item in enumerate(string_list):
+        if i > 0:
+            hasher.update(separator)
+        hasher.update(item.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _stat_entry(entry: os.DirEntry) -> Optional[os.stat_result]:
     """
-    joined = '\0'.join(string_list)  # Use a delimiter unlikely to appear in strings
-    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+    Stats a directory entry, following symlinks.
+
+    Parameters:
+      entry (os.DirEntry): The entry to stat.
+
+    Returns:
+      os.stat_result | None: The entry's stat result, or None if it cannot be stat'ed (e.g. a broken symlink).
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        return None
 
 
-def compute_directory_hash(directory: str) -> str:
+def compute_directory_hash(directory: str, fast: bool = False) -> str:
     """
     Computes a unique hash for the contents of a directory based on the list of items,
     their creation dates, and their modification dates.
@@ -154,80 +248,115 @@ def compute_directory_hash(directory: str) -> str:
     - The creation timestamp.
     - The modification timestamp.
     
-    The list of these strings is then sorted to ensure consistent ordering and hashed to produce
-    a unique fingerprint representing the state of the directory.
+    The list of these strings is then sorted to ensure consistent ordering and hashed, along with
+    DIRECTORY_HASH_VERSION, to produce a unique fingerprint representing the state of the directory.
+
+    With fast=True, each item is instead a raw bytes record of its name and its modification time
+    in nanoseconds (packed little-endian), skipping the creation time and the conversion of the
+    timestamps to strings. The records are sorted and hashed in one call. Fast hashes differ from
+    regular ones, so a cache must always be checked in the mode it was saved with.
 
     Parameters:
       directory (str): The path of the directory to hash.
+      fast (bool): Whether to hash only the names and modification times as raw bytes. Defaults to False.
 
     Returns:
-      str: A hexadecimal string representing the SHA-256 hash of the directory's contents.
+      str: A hexadecimal string representing the hash of the directory's contents.
     """
+    with os.scandir(directory) as it:
+        entries = list(it)
+
+    # A single stat per entry gives its type and both timestamps. stat releases the GIL, so large
+    # directories (e.g. on a network filesystem) are stat'ed from a thread pool.
+    if len(entries) > PARALLEL_STAT_MIN_ENTRIES:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(32, len(entries))) as executor:
+            stats = list(executor.map(_stat_entry, entries))
+    else:
+        stats = [_stat_entry(entry) for entry in entries]
+
     items = []
-    for entry in os.listdir(directory):
-        path = os.path.join(directory, entry)
+    for entry, st in zip(entries, stats):
         # Process both files and directories
-        if os.path.isfile(path) or os.path.isdir(path):
-            try:
-                ctime = os.path.getctime(path)
-                mtime = os.path.getmtime(path)
-            except Exception:
-                ctime = 0
-                mtime = 0
-            items.append(f"{entry}:{ctime}:{mtime}")
+        if st is not None and (stat.S_ISREG(st.st_mode) or stat.S_ISDIR(st.st_mode)):
+            if fast:
+                items.append(os.fsencode(entry.name) + b'\0' + struct.pack('<q', st.st_mtime_ns))
+            else:
+                items.append(f"{entry.name}:{st.st_ctime}:{st.st_mtime}")
     items.sort()  # Ensure the order is consistent
-    return hash_string_list(items)
+
+    if fast:
+        import hashlib
+
+        hasher = hashlib.blake2b(f"v{DIRECTORY_HASH_VERSION}-fast\0".encode('ascii'), digest_size=32)
+        hasher.update(b''.join(items))
+        return hasher.hexdigest()
+    return hash_string_list([f"v{DIRECTORY_HASH_VERSION}"] + items)
 
 
-def save_cache_quick(directory: str, cache_file: str) -> None:
+def save_cache_quick(directory: str, cache_file: str, fast: bool = False) -> None:
     """
-    Computes the directory hash and saves it to a pickle file.
+    Computes the directory hash and saves it to a plain text cache file.
 
     This function calculates a unique hash for the specified directory based on the list of its
-    items along with their creation and modification dates. The hash is then saved to a pickle file,
-    which can be later used to determine if the directory contents have changed.
+    items along with their creation and modification dates. The hash is then written to the cache file
+    as ASCII text, along with the modification time of the directory itself (in nanoseconds), which
+    can be later used to determine if the directory contents have changed.
 
     Parameters:
       directory (str): The path of the directory to hash.
-      cache_file (str): The path to the pickle file where the computed hash is saved.
+      cache_file (str): The path to the cache file where the computed hash is saved.
+      fast (bool): Whether to use the fast hash of compute_directory_hash. Defaults to False.
 
     Example:
-      >>> save_cache_quick("/path/to/directory", "cache.pkl")
+      >>> save_cache_quick("/path/to/directory", "cache.txt")
     """
-    dir_hash = compute_directory_hash(directory)
+    # Stat the directory before hashing, so a change made during the scan invalidates the cache.
+    dir_mtime_ns = os.stat(directory).st_mtime_ns
+    dir_hash = compute_directory_hash(directory, fast=fast)
     with open(cache_file, 'wb') as f:
-        pickle.dump(dir_hash, f)
+        f.write(f"{dir_mtime_ns} {dir_hash}".encode('ascii'))
 
 
-def is_cached(directory: str, cache_file: str) -> bool:
+def is_cached(directory: str, cache_file: str, fast: bool = False, trust_directory_mtime: bool = False) -> bool:
     """
     Checks if the current directory contents match the previously cached state.
 
     This function computes the current hash for the directory (based on the items, their creation
-    dates, and modification dates) and compares it to the hash stored in the pickle file. It returns
+    dates, and modification dates) and compares it to the hash stored in the cache file. It returns
     True if the hashes are identical (indicating no changes), or False otherwise.
 
+    With trust_directory_mtime=True, the directory is first considered unchanged without scanning it
+    if its own modification time still equals the one stored in the cache file. Adding, removing or
+    renaming an entry updates the directory's modification time, but rewriting or appending to an
+    existing file does not, so only use it for directories whose files are never modified in place.
+
     Parameters:
       directory (str): The path of the directory to check.
-      cache_file (str): The path to the pickle file where the previous hash is stored.
+      cache_file (str): The path to the cache file where the previous hash is stored.
+      fast (bool): Whether the hash was saved with the fast hash of compute_directory_hash. Defaults to False.
+      trust_directory_mtime (bool): Whether an unchanged directory modification time alone means the
+                                    directory is unchanged. Defaults to False.
 
     Returns:
       bool: True if the directory's current state matches the cached state, False if it has changed.
 
     Example:
-      >>> if is_cached("/path/to/directory", "cache.pkl"):
+      >>> if is_cached("/path/to/directory", "cache.txt"):
       ...     tprint("Directory is unchanged.")
       ... else:
       ...     tprint("Directory has been modified.")
     """
-    current_hash = compute_directory_hash(directory)
     try:
         with open(cache_file, 'rb') as f:
-            cached_hash = pickle.load(f)
-    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            cached_mtime_ns, cached_hash = f.read().decode('ascii').split()
+        if trust_directory_mtime and os.stat(directory).st_mtime_ns == int(cached_mtime_ns):
+            return True
+    except (OSError, UnicodeDecodeError, ValueError):
         # If the cache file doesn't exist or can't be read, consider the directory as changed.
         return False
-    return current_hash == cached_hash
+    return compute_directory_hash(directory, fast=fast) == cached_hash
 
 def cpu_pct_to_cores(pct: float) -> int:
     """
@@ -235,7 +364,7 @@ def cpu_pct_to_cores(pct: float) -> int:
 
     This function calculates the number of CPU cores corresponding to a given percentage (as a float)
     of the total available cores on the system. It multiplies the percentage by the total core count
-    obtained from os.cpu_count(), and ensures that at least one core is returned.
+    obtained from os.cpu_count() (read once at import), and ensures that at least one core is returned.
 
     Parameters:
       pct (float): A fractional value representing the desired percentage of CPU cores.
@@ -253,9 +382,9 @@ def cpu_pct_to_cores(pct: float) -> int:
     """
 
     if pct < 0.0 or pct > 1.0:
-        raise("Percentage must be a value between 0.0 and 1.0 for determining core count")
+        raise ValueError("Percentage must be a value between 0.0 and 1.0 for determining core count")
 
-    return int(max(pct * os.cpu_count(), 1))
+    return int(max(pct * _CPU_COUNT, 1))
 
 
 def lerp(start: float, end: float, t: float) -> float:
@@ -274,15 +403,51 @@ def lerp(start: float, end: float, t: float) -> float:
                  will extrapolate beyond the provided `start` and `end`.
 
     Returns:
-      float: The interpolated value computed as (1 - t) * start + t * end.
+      float: The interpolated value computed as (1 - t) * start + t * end. On Python 3.13+ this is
+             evaluated with fused multiply-adds (math.fma), which round once per step.
 
     Example:
       >>> lerp(10.0, 20.0, 0.5)
       15.0
     """
+    if _fma is not None:
+        # t * end + (start - t * start), which still gives exactly start at t = 0 and end at t = 1.
+        return _fma(t, end, _fma(-t, start, start))
     return (1 - t) * start + t * end
 
 
+def lerp_vec(start: Any, end: Any, t: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Computes the element-wise linear interpolation between arrays of values.
+
+    This is the NumPy counterpart of lerp for callers that interpolate many points at once. The
+    inputs are broadcast against each other, and the result can be written into a preallocated
+    `out` buffer so that repeated calls do not allocate a new array each time.
+
+    Parameters:
+      start (array_like): The starting values.
+      end (array_like): The ending values.
+      t (array_like): The interpolation factors, typically in the range [0.0, 1.0].
+      out (np.ndarray, optional): A float array with the broadcast shape of the inputs to hold the result.
+
+    Returns:
+      np.ndarray: The interpolated values computed as start + t * (end - start), which is `out` if given.
+
+    Example:
+      >>> lerp_vec(np.array([0.0, 10.0]), np.array([10.0, 20.0]), 0.5)
+      array([ 5., 15.])
+    """
+    import numpy as np
+
+    start = np.asarray(start, dtype=np.float64)
+    if out is None:
+        out = np.empty(np.broadcast(start, end, t).shape, dtype=np.float64)
+    np.subtract(end, start, out=out)
+    np.multiply(t, out, out=out)
+    np.add(start, out, out=out)
+    return out
+
+
 def is_mostly_text(file_path: str, threshold=0.95) -> bool:
     """
     Determines whether a file is predominantly composed of text-like content.
@@ -322,4 +487,4 @@ def is_mostly_text(file_path: str, threshold=0.95) -> bool:
     text_like = sum(1 for byte in data if byte in allowed_chars)
     ratio = text_like / len(data)
 
-    return ratio >= threshold
\ No newline at end of file
+    return ratio >= threshold